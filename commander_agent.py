@@ -1,8 +1,8 @@
 
 
 
-from typing import Dict, Any, List
-import json
+from typing import Dict, Any, Iterator, List, Mapping
+from functools import cache
 from pathlib import Path
 
 from azure.ai.agents import AgentsClient
@@ -13,38 +13,80 @@ from azure.ai.agents.models import (
 )
 from azure.identity import DefaultAzureCredential
 
+from json_utils import dumps, freeze, load_json
+from keyword_matcher import KeywordMatcher
+
+
+# ===================================================
+# Keyword Automatons (built once at import)
+# ===================================================
+
+_LOGS_KW = frozenset({
+    "latency", "timeout", "retry", "error",
+    "circuit", "failure"
+})
+
+_METRICS_KW = frozenset({
+    "capacity", "exhaustion", "connections",
+    "autoscaling", "saturation", "usage"
+})
+
+_DEPLOY_KW = frozenset({
+    "deployment", "config", "change", "release"
+})
+
+_AGENT_MATCHER = KeywordMatcher({
+    "logs_agent": _LOGS_KW,
+    "metrics_agent": _METRICS_KW,
+    "deploy_intelligence_agent": _DEPLOY_KW
+})
+
+_VERDICT_MATCHER = KeywordMatcher({
+    "db_connection": ["connection", "dbtimeout"],
+    "retry": ["retry"],
+    "autoscaling": ["autoscaling"],
+    "config_change": ["deployment", "config"]
+})
+
 
 # ===================================================
 # Commander Agent Tool Functions
 # ===================================================
 
-def decide_agents(incident: Dict[str, Any]) -> Dict[str, Any]:
+def _iter_symptoms(value: Any) -> Iterator[str]:
     """
-    Decide which diagnostic agents to invoke based on expected symptoms.
+    Yield every lowercased symptom string in a JSON value, descending into
+    objects (values only) and arrays so no repr punctuation is scanned.
     """
-    expected = str(incident.get("expected_symptoms", {})).lower()
-    agents: List[str] = []
+    if isinstance(value, str):
+        yield value.lower()
+    elif isinstance(value, Mapping):
+        for item in value.values():
+            yield from _iter_symptoms(item)
+    elif isinstance(value, (list, tuple)):
+        for item in value:
+            yield from _iter_symptoms(item)
+    elif value is not None:
+        yield str(value).lower()
 
-    if any(k in expected for k in [
-        "latency", "timeout", "retry", "error",
-        "circuit", "failure"
-    ]):
-        agents.append("logs_agent")
 
-    if any(k in expected for k in [
-        "capacity", "exhaustion", "connections",
-        "autoscaling", "saturation", "usage"
-    ]):
-        agents.append("metrics_agent")
+def decide_agents(incident: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Decide which diagnostic agents to invoke based on expected symptoms.
+    """
+    if not incident.get("expected_symptoms"):
+        return {
+            "incident_id": incident["incident_id"],
+            "agents_to_call": []
+        }
 
-    if any(k in expected for k in [
-        "deployment", "config", "change", "release"
-    ]):
-        agents.append("deploy_intelligence_agent")
+    # Tool input comes from the model, so accept any JSON shape
+    expected = " ".join(_iter_symptoms(incident["expected_symptoms"]))
+    agents = _AGENT_MATCHER.scan(expected)
 
     return {
         "incident_id": incident["incident_id"],
-        "agents_to_call": list(set(agents))
+        "agents_to_call": sorted(agents)
     }
 
 
@@ -55,9 +97,8 @@ def synthesize_verdict(
     """
     Commander-only synthesis of final incident verdict.
     """
-    combined_text = " ".join(
-        json.dumps(f).lower() for f in agent_findings
-    )
+    combined_text = dumps(agent_findings).lower()
+    hits = _VERDICT_MATCHER.scan(combined_text)
 
     failure_summary = []
     remediation = {
@@ -68,7 +109,7 @@ def synthesize_verdict(
 
     root_cause = "Undetermined"
 
-    if "connection" in combined_text or "dbtimeout" in combined_text:
+    if "db_connection" in hits:
         root_cause = (
             "Database connection pool exhaustion caused by "
             "application scaling without corresponding database capacity"
@@ -80,12 +121,12 @@ def synthesize_verdict(
             "Increase database max_connections temporarily"
         )
 
-    if "retry" in combined_text:
+    if "retry" in hits:
         failure_summary.append(
             "Retry storms amplified database pressure"
         )
 
-    if "autoscaling" in combined_text:
+    if "autoscaling" in hits:
         failure_summary.append(
             "Application autoscaled without database capacity alignment"
         )
@@ -93,7 +134,7 @@ def synthesize_verdict(
             "Reduce application replica count"
         )
 
-    if "deployment" in combined_text or "config" in combined_text:
+    if "config_change" in hits:
         remediation["immediate"].append(
             "Rollback recent configuration deployment"
         )
@@ -118,13 +159,17 @@ def synthesize_verdict(
 # Context Loader (Topology + Scenario)
 # ===================================================
 
-def load_context_data() -> Dict[str, Any]:
+@cache
+def load_context_data() -> Mapping[str, Any]:
+    """
+    Load topology and scenario context. Cached; the result is read-only.
+    """
     base = Path("mock-data")
 
-    return {
-        "topology": json.load(open(base / "topology/production.json")),
-        "scenario": json.load(
-            open(base / "scenarios/inc-db-5001-database-failure.json")
+    return freeze({
+        "topology": load_json(base / "topology/production.json"),
+        "scenario": load_json(
+            base / "scenarios/inc-db-5001-database-failure.json"
         ),
         "data_references": {
             "logs": [
@@ -139,17 +184,51 @@ def load_context_data() -> Dict[str, Any]:
                 "infrastructure"
             ]
         }
-    }
+    })
+
+
+@cache
+def _context_json() -> bytes:
+    return dumps(load_context_data())
+
+
+def build_commander_message(
+    incident: Dict[str, Any],
+    instructions: str
+) -> str:
+    """
+    Assemble the Commander input JSON around the cached, pre-serialized
+    context so only the incident-specific parts are serialized per call.
+    """
+    return (
+        b'{"incident":' + dumps(incident)
+        + b',"context":' + _context_json()
+        + b',"instructions":' + dumps(instructions)
+        + b"}"
+    ).decode()
+
+
+def invalidate_context_cache() -> None:
+    """
+    Drop cached context so the next load re-reads files from disk.
+    """
+    load_context_data.cache_clear()
+    _context_json.cache_clear()
 
 
 # ===================================================
 # Azure Agents Client
 # ===================================================
 
-agents_client = AgentsClient(
-    endpoint="",
-    credential=DefaultAzureCredential()
-)
+@cache
+def _client() -> AgentsClient:
+    """
+    Lazily construct the shared Azure Agents client on first use.
+    """
+    return AgentsClient(
+        endpoint="",
+        credential=DefaultAzureCredential()
+    )
 
 
 # ===================================================
@@ -171,14 +250,19 @@ commander_tools = ToolSet(
     ]
 )
 
-commander_agent = agents_client.agents.create(
-    name="commander_agent",
-    description=(
-        "Autonomous Incident Commander responsible for "
-        "planning investigations and synthesizing final verdicts."
-    ),
-    tools=commander_tools,
-    instructions="""
+@cache
+def get_commander_agent():
+    """
+    Create the Commander agent on first use and reuse it afterwards.
+    """
+    return _client().agents.create(
+        name="commander_agent",
+        description=(
+            "Autonomous Incident Commander responsible for "
+            "planning investigations and synthesizing final verdicts."
+        ),
+        tools=commander_tools,
+        instructions="""
 You are the Incident Commander.
 
 Rules:
@@ -191,7 +275,7 @@ Rules:
 
 Always output structured JSON.
 """
-)
+    )
 
 
 # ===================================================
@@ -200,8 +284,6 @@ Always output structured JSON.
 
 if __name__ == "__main__":
 
-    context_data = load_context_data()
-
     incident_payload = {
         "incident_id": "inc-db-5001",
         "title": "Database connection pool exhaustion",
@@ -225,30 +307,26 @@ if __name__ == "__main__":
         }
     }
 
-    commander_input = {
-        "incident": incident_payload,
-        "context": context_data,
-        "instructions": (
-            "Use context for planning only. "
-            "Do not analyze logs or metrics. "
-            "Decide agents, await findings, and produce final verdict."
-        )
-    }
+    instructions = (
+        "Use context for planning only. "
+        "Do not analyze logs or metrics. "
+        "Decide agents, await findings, and produce final verdict."
+    )
 
     # Create a thread
-    thread = agents_client.threads.create()
+    thread = _client().threads.create()
 
     # Send enriched context to Commander
-    agents_client.messages.create(
+    _client().messages.create(
         thread_id=thread.id,
         role=MessageRole.USER,
-        content=json.dumps(commander_input, indent=2)
+        content=build_commander_message(incident_payload, instructions)
     )
 
     # Run Commander Agent
-    run = agents_client.runs.create(
+    run = _client().runs.create(
         thread_id=thread.id,
-        agent_id=commander_agent.id
+        agent_id=get_commander_agent().id
     )
 
     print(f"Commander run started: {run.id}")
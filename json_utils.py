@@ -0,0 +1,130 @@
+"""
+JSON helpers backed by orjson, with the stdlib json module as fallback.
+
+Known differences from stdlib json when orjson is installed:
+- NaN and Infinity serialize as null instead of the non-standard NaN/Infinity.
+- Integers beyond 64 bits parse as floats (99999999999999999999999 -> 1e+23).
+Values orjson cannot encode at all, such as integers beyond 64 bits, are
+serialized with the stdlib instead.
+"""
+
+import json
+import mmap
+import os
+from collections.abc import Mapping
+from pathlib import Path
+from types import MappingProxyType
+from typing import Any
+
+try:
+    import orjson
+except ImportError:  # stdlib fallback when orjson is unavailable
+    orjson = None
+
+
+# Files above this size are memory-mapped and parsed in place; smaller ones
+# are cheaper to read straight into memory than to map.
+MMAP_THRESHOLD = 64 * 1024
+
+# O_NOATIME (Linux) skips access-time updates; O_BINARY (Windows) disables
+# newline translation. Either is 0 where the platform does not define it.
+_OPEN_FLAGS = os.O_RDONLY | getattr(os, "O_BINARY", 0)
+_O_NOATIME = getattr(os, "O_NOATIME", 0)
+
+
+# ===================================================
+# JSON Serialization Helpers (orjson with stdlib fallback)
+# ===================================================
+
+def _default(obj: Any) -> Any:
+    if isinstance(obj, Mapping):
+        return dict(obj)
+    raise TypeError(f"Object of type {type(obj).__name__} is not JSON serializable")
+
+
+def dumps(obj: Any, indent: bool = False) -> bytes:
+    """
+    Serialize obj to UTF-8 JSON bytes, optionally indented by two spaces.
+    Read-only mappings produced by freeze() are serialized as objects.
+    """
+    if orjson is not None:
+        try:
+            return orjson.dumps(
+                obj,
+                default=_default,
+                option=orjson.OPT_INDENT_2 if indent else None
+            )
+        except TypeError:
+            # orjson rejects some valid input (e.g. integers beyond 64 bits)
+            pass
+
+    return json.dumps(
+        obj, default=_default, indent=2 if indent else None
+    ).encode("utf-8")
+
+
+def loads(data: bytes) -> Any:
+    """
+    Parse JSON from bytes (or str).
+    """
+    if orjson is not None:
+        return orjson.loads(data)
+
+    return json.loads(data)
+
+
+def freeze(obj: Any) -> Any:
+    """
+    Recursively convert dicts to read-only mappings and lists to tuples,
+    so cached loader results cannot be mutated by callers.
+    """
+    if isinstance(obj, dict):
+        return MappingProxyType({key: freeze(value) for key, value in obj.items()})
+    if isinstance(obj, list):
+        return tuple(freeze(value) for value in obj)
+    return obj
+
+
+def read_file(path: Path) -> bytes:
+    """
+    Read a whole file with raw os calls, bypassing Python's buffered IO.
+    """
+    try:
+        fd = os.open(path, _OPEN_FLAGS | _O_NOATIME)
+    except PermissionError:
+        # O_NOATIME is only allowed for the file owner
+        fd = os.open(path, _OPEN_FLAGS)
+
+    try:
+        size = os.fstat(fd).st_size
+        data = os.read(fd, size)
+
+        while len(data) < size:
+            chunk = os.read(fd, size - len(data))
+            if not chunk:
+                break
+            data += chunk
+
+        return data
+    finally:
+        os.close(fd)
+
+
+def _load_mmap(path: Path) -> Any:
+    with open(path, "rb") as f:
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            with memoryview(mm) as view:
+                return orjson.loads(view)
+
+
+def load_json(path: Path) -> Any:
+    """
+    Read a JSON file as raw bytes and parse it, skipping the text decode layer.
+    Large files are memory-mapped when orjson is available.
+    """
+    path = Path(path)
+
+    if orjson is not None and path.stat().st_size > MMAP_THRESHOLD:
+        return _load_mmap(path)
+
+    return loads(read_file(path))
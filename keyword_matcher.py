@@ -0,0 +1,79 @@
+import re
+from typing import Dict, Iterable, Set, Union
+
+try:
+    import ahocorasick
+except ImportError:  # compiled regex scan when pyahocorasick is unavailable
+    ahocorasick = None
+
+
+# ===================================================
+# Multi-Keyword Tagging (Aho-Corasick)
+# ===================================================
+
+class KeywordMatcher:
+    """
+    Tags text with every keyword group it mentions in a single pass.
+    """
+
+    def __init__(self, groups: Dict[str, Iterable[str]]):
+        self.keywords: Dict[str, tuple] = {}
+        for tag, keywords in groups.items():
+            for keyword in keywords:
+                self.keywords[keyword] = self.keywords.get(keyword, ()) + (tag,)
+
+        self._automaton = None
+        if ahocorasick is not None:
+            automaton = ahocorasick.Automaton()
+            for keyword, tags in self.keywords.items():
+                automaton.add_word(keyword, tags)
+            automaton.make_automaton()
+            self._automaton = automaton
+            return
+
+        # Fallback: one regex pass. The lookahead reports a match at every
+        # position, but only the longest keyword starting there, so each
+        # keyword also carries the tags of keywords that are its prefixes.
+        self._prefix_tags = {
+            keyword: tuple({
+                tag
+                for other, tags in self.keywords.items()
+                if keyword.startswith(other)
+                for tag in tags
+            })
+            for keyword in self.keywords
+        }
+        self._byte_prefix_tags = {
+            keyword.encode("utf-8"): tags
+            for keyword, tags in self._prefix_tags.items()
+        }
+        alternation = "|".join(
+            re.escape(keyword)
+            for keyword in sorted(self.keywords, key=len, reverse=True)
+        )
+        self._pattern = re.compile(f"(?=({alternation}))")
+        self._byte_pattern = re.compile(f"(?=({alternation}))".encode("utf-8"))
+
+    def scan(self, text: Union[str, bytes]) -> Set[str]:
+        """
+        Return the set of tags whose keywords occur in the lowercased text.
+        Accepts str or raw UTF-8 bytes.
+        """
+        hits: Set[str] = set()
+
+        if self._automaton is None:
+            if isinstance(text, bytes):
+                pattern, prefix_tags = self._byte_pattern, self._byte_prefix_tags
+            else:
+                pattern, prefix_tags = self._pattern, self._prefix_tags
+
+            for match in pattern.finditer(text):
+                hits.update(prefix_tags[match.group(1)])
+            return hits
+
+        if isinstance(text, bytes):
+            text = text.decode("utf-8", "replace")
+
+        for _, tags in self._automaton.iter(text):
+            hits.update(tags)
+        return hits
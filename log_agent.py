@@ -1,8 +1,9 @@
 
 
-import json
+from concurrent.futures import ThreadPoolExecutor
+from functools import cache, lru_cache
 from pathlib import Path
-from typing import Dict, Any, List
+from typing import Dict, Any, Mapping, Set
 
 from azure.ai.agents import AgentsClient
 from azure.ai.agents.models import (
@@ -12,6 +13,30 @@ from azure.ai.agents.models import (
 )
 from azure.identity import DefaultAzureCredential
 
+from json_utils import dumps, freeze, load_json
+from keyword_matcher import KeywordMatcher
+
+
+# ===================================================
+# Log Keyword Rules (built once at import)
+# ===================================================
+
+_LOG_MATCHER = KeywordMatcher({
+    "timeouts": ["timeout"],
+    "retry_storms": ["retry"],
+    "connection_exhaustion": [
+        "too many connections", "connection pool exhausted"
+    ],
+    "circuit_breaker": ["circuit"]
+})
+
+_LOG_FINDINGS = {
+    "timeouts": "Application experienced database timeouts",
+    "retry_storms": "Retry storms detected in application logs",
+    "connection_exhaustion": "Database rejected connections due to connection limit",
+    "circuit_breaker": "Circuit breakers activated under load"
+}
+
 
 # ===================================================
 # Log Agent Analysis Function
@@ -29,26 +54,21 @@ def analyze_logs(input_payload: Dict[str, Any]) -> Dict[str, Any]:
     incident_id = incident["incident_id"]
     logs = context.get("logs", {})
 
-    findings: List[str] = []
+    findings: Set[str] = set()
     evidence: Dict[str, Any] = {}
 
-    logs_text = json.dumps(logs).lower()
-
-    if "timeout" in logs_text:
-        findings.append("Application experienced database timeouts")
-        evidence["timeouts"] = True
-
-    if "retry" in logs_text:
-        findings.append("Retry storms detected in application logs")
-        evidence["retry_storms"] = True
-
-    if "too many connections" in logs_text or "connection pool exhausted" in logs_text:
-        findings.append("Database rejected connections due to connection limit")
-        evidence["connection_exhaustion"] = True
+    # Scan the serialized parsed logs rather than raw file bytes, so findings
+    # never depend on how the source files happen to format values.
+    # Nothing to scan when no logs were provided
+    if logs:
+        hits = _LOG_MATCHER.scan(dumps(logs).lower())
+    else:
+        hits = set()
 
-    if "circuit" in logs_text:
-        findings.append("Circuit breakers activated under load")
-        evidence["circuit_breaker"] = True
+    for tag, finding in _LOG_FINDINGS.items():
+        if tag in hits:
+            findings.add(finding)
+            evidence[tag] = True
 
     hypothesis = (
         "Log patterns indicate downstream database connection saturation "
@@ -58,7 +78,7 @@ def analyze_logs(input_payload: Dict[str, Any]) -> Dict[str, Any]:
     return {
         "agent": "log_agent",
         "incident_id": incident_id,
-        "findings": list(set(findings)),
+        "findings": sorted(findings),
         "evidence": evidence,
         "hypothesis": hypothesis,
         "confidence": 0.93
@@ -69,25 +89,69 @@ def analyze_logs(input_payload: Dict[str, Any]) -> Dict[str, Any]:
 # Context Loader (LOGS ONLY)
 # ===================================================
 
-def load_log_context(incident_id: str) -> Dict[str, Any]:
+@lru_cache(maxsize=32)
+def load_log_context(incident_id: str) -> Mapping[str, Any]:
+    """
+    Load logs for an incident. Cached per incident; the result is read-only.
+    """
     base = Path("mock-data") / "logs" / incident_id
 
-    return {
-        "high_level": json.load(open(base / "high_level.json")),
-        "application": json.load(open(base / "application_logs.json")),
-        "database": json.load(open(base / "database_logs.json")),
-        "infrastructure": json.load(open(base / "infrastructure_logs.json")),
+    paths = {
+        "high_level": base / "high_level.json",
+        "application": base / "application_logs.json",
+        "database": base / "database_logs.json",
+        "infrastructure": base / "infrastructure_logs.json",
     }
 
+    # Files are independent; load them concurrently
+    with ThreadPoolExecutor(max_workers=len(paths)) as executor:
+        loaded = dict(zip(paths, executor.map(load_json, paths.values())))
+
+    return freeze(loaded)
+
+
+@lru_cache(maxsize=32)
+def _log_context_json(incident_id: str) -> bytes:
+    return dumps(load_log_context(incident_id))
+
+
+def build_log_agent_message(
+    incident: Dict[str, Any],
+    instructions: str
+) -> str:
+    """
+    Assemble the Log Agent input JSON around the cached, pre-serialized
+    log context so only the incident-specific parts are serialized per call.
+    """
+    return (
+        b'{"incident":' + dumps(incident)
+        + b',"context":{"logs":' + _log_context_json(incident["incident_id"])
+        + b'},"instructions":' + dumps(instructions)
+        + b"}"
+    ).decode()
+
+
+def invalidate_log_cache() -> None:
+    """
+    Drop cached log context so the next load re-reads files from disk.
+    """
+    load_log_context.cache_clear()
+    _log_context_json.cache_clear()
+
 
 # ===================================================
 # Create Agents Client
 # ===================================================
 
-agents_client = AgentsClient(
-    endpoint="",
-    credential=DefaultAzureCredential()
-)
+@cache
+def _client() -> AgentsClient:
+    """
+    Lazily construct the shared Azure Agents client on first use.
+    """
+    return AgentsClient(
+        endpoint="",
+        credential=DefaultAzureCredential()
+    )
 
 
 # ===================================================
@@ -109,11 +173,16 @@ log_agent_tools = ToolSet(
 # Create Log Agent
 # ===================================================
 
-log_agent = agents_client.agents.create(
-    name="log_agent",
-    description="Analyzes logs to identify failure patterns",
-    tools=log_agent_tools,
-    instructions="""
+@cache
+def get_log_agent():
+    """
+    Create the Log agent on first use and reuse it afterwards.
+    """
+    return _client().agents.create(
+        name="log_agent",
+        description="Analyzes logs to identify failure patterns",
+        tools=log_agent_tools,
+        instructions="""
 You are a Log Analysis Agent.
 
 Rules:
@@ -124,7 +193,7 @@ Rules:
 - Be concise, factual, and evidence-based.
 - Output structured JSON only.
 """
-)
+    )
 
 
 # ===================================================
@@ -140,33 +209,25 @@ if __name__ == "__main__":
         "severity": "SEV-1"
     }
 
-    log_context = load_log_context(INCIDENT_ID)
-
-    log_agent_input = {
-        "incident": incident_payload,
-        "context": {
-            "logs": log_context
-        },
-        "instructions": (
-            "Analyze only the provided logs and return findings. "
-            "Do not infer root cause beyond log evidence."
-        )
-    }
+    instructions = (
+        "Analyze only the provided logs and return findings. "
+        "Do not infer root cause beyond log evidence."
+    )
 
     # Create a thread
-    thread = agents_client.threads.create()
+    thread = _client().threads.create()
 
     # Send context-enriched payload to Log Agent
-    agents_client.messages.create(
+    _client().messages.create(
         thread_id=thread.id,
         role=MessageRole.USER,
-        content=json.dumps(log_agent_input, indent=2)
+        content=build_log_agent_message(incident_payload, instructions)
     )
 
     # Run Log Agent
-    run = agents_client.runs.create(
+    run = _client().runs.create(
         thread_id=thread.id,
-        agent_id=log_agent.id
+        agent_id=get_log_agent().id
     )
 
     print(f"Log agent run started: {run.id}")
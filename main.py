@@ -1,16 +1,24 @@
-import json
+import sys
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
 from pathlib import Path
+from typing import List
 from azure.ai.agents import AgentsClient
-from azure.ai.agents.models import ConnectedAgentTool, MessageRole
+from azure.ai.agents.models import (
+    ConnectedAgentTool,
+    MessageDeltaChunk,
+    MessageRole,
+    SubmitToolOutputsAction,
+    ThreadRun,
+    ToolOutput
+)
 from azure.identity import DefaultAzureCredential
 
-
-# -----------------------------
-# Helper to load JSON files
-# -----------------------------
-def load_json(path: Path):
-    with open(path, "r", encoding="utf-8") as f:
-        return json.load(f)
+from commander_agent import decide_agents, synthesize_verdict
+from json_utils import dumps, freeze, load_json, loads
+from log_agent import analyze_logs
+from metrics_agent import analyze_metrics
 
 
 # -----------------------------
@@ -22,17 +30,26 @@ INCIDENT_ID = "inc-db-5001"
 topology = load_json(BASE_PATH / "topology/production.json")
 scenario = load_json(BASE_PATH / "scenarios/inc-db-5001-database-failure.json")
 
-logs = {
-    "high_level": load_json(BASE_PATH / f"logs/{INCIDENT_ID}/high_level.json"),
-    "application": load_json(BASE_PATH / f"logs/{INCIDENT_ID}/application_logs.json"),
-    "database": load_json(BASE_PATH / f"logs/{INCIDENT_ID}/database_logs.json"),
-    "infrastructure": load_json(BASE_PATH / f"logs/{INCIDENT_ID}/infrastructure_logs.json"),
+# Logs and metrics are handed to sub-agents by reference only; the
+# Commander never analyzes them, so they are not inlined into its prompt.
+data_references = {
+    "logs": {
+        "high_level": f"logs/{INCIDENT_ID}/high_level.json",
+        "application": f"logs/{INCIDENT_ID}/application_logs.json",
+        "database": f"logs/{INCIDENT_ID}/database_logs.json",
+        "infrastructure": f"logs/{INCIDENT_ID}/infrastructure_logs.json",
+    },
+    "metrics": {
+        "application": f"metrics/{INCIDENT_ID}/application_metrics.json",
+        "database": f"metrics/{INCIDENT_ID}/database_metrics.json",
+        "infrastructure": f"metrics/{INCIDENT_ID}/infrastructure_metrics.json",
+    },
 }
 
-metrics = {
-    "application": load_json(BASE_PATH / f"metrics/{INCIDENT_ID}/application_metrics.json"),
-    "database": load_json(BASE_PATH / f"metrics/{INCIDENT_ID}/database_metrics.json"),
-    "infrastructure": load_json(BASE_PATH / f"metrics/{INCIDENT_ID}/infrastructure_metrics.json"),
+# Fields already listed under INCIDENT DETAILS are dropped from the scenario
+scenario_context = {
+    key: value for key, value in scenario.items()
+    if key not in ("incident_id", "severity", "environment")
 }
 
 
@@ -51,18 +68,13 @@ Severity: {scenario["severity"]}
 Environment: {scenario["environment"]}
 
 TOPOLOGY (REFERENCE ONLY):
-{json.dumps(topology, indent=2)}
+{dumps(topology).decode()}
 
 SCENARIO CONTEXT (REFERENCE ONLY):
-{json.dumps(scenario, indent=2)}
+{dumps(scenario_context).decode()}
 
-OBSERVABILITY DATA (FOR AGENT CONTEXT — NOT FOR DIRECT ANALYSIS):
-
-LOGS:
-{json.dumps(logs, indent=2)}
-
-METRICS:
-{json.dumps(metrics, indent=2)}
+OBSERVABILITY DATA REFERENCES (FOR AGENT CONTEXT — NOT FOR DIRECT ANALYSIS):
+{dumps(data_references).decode()}
 
 AVAILABLE AGENTS:
 - Logs Agent (Forensic Expert)
@@ -112,6 +124,170 @@ metrics_tool = ConnectedAgentTool(
 )
 
 
+# -----------------------------
+# Run streaming with failsafe timeout
+# -----------------------------
+RUN_TIMEOUT_SECONDS = 30
+MAX_COMPLETION_TOKENS = 500
+
+TOOL_FUNCTIONS = {
+    "decide_agents": decide_agents,
+    "synthesize_verdict": synthesize_verdict,
+    "analyze_logs": analyze_logs,
+    "analyze_metrics": analyze_metrics,
+}
+
+# Context key each analysis tool reads its data from
+TOOL_DATA_DOMAINS = {
+    "analyze_logs": "logs",
+    "analyze_metrics": "metrics",
+}
+
+
+@lru_cache(maxsize=32)
+def load_data_reference(reference: str):
+    return freeze(load_json(BASE_PATH / reference))
+
+
+def resolve_data_references(tool_name: str, arguments):
+    """
+    Fill an analysis tool's logs/metrics context from data_references.
+    The model only ever sees the references, never the data, so whatever it
+    sent under that key is replaced. Only advertised files can be loaded.
+    """
+    domain = TOOL_DATA_DOMAINS.get(tool_name)
+    if domain is None or not isinstance(arguments, dict):
+        return arguments
+
+    payload = arguments.get("input_payload")
+    if not isinstance(payload, dict):
+        return arguments
+
+    context = payload.get("context")
+    if not isinstance(context, dict):
+        context = payload["context"] = {}
+
+    context[domain] = {
+        key: load_data_reference(reference)
+        for key, reference in data_references[domain].items()
+    }
+    return arguments
+
+
+def execute_tool_call(tool_call) -> ToolOutput:
+    fn = TOOL_FUNCTIONS.get(tool_call.function.name)
+
+    if fn is None:
+        output = {"error": f"Unknown tool: {tool_call.function.name}"}
+    else:
+        try:
+            arguments = resolve_data_references(
+                tool_call.function.name,
+                loads(tool_call.function.arguments or "{}")
+            )
+            output = fn(**arguments)
+        except Exception as e:
+            output = {"error": str(e)}
+
+    return ToolOutput(tool_call_id=tool_call.id, output=dumps(output).decode())
+
+
+def execute_tool_calls(tool_calls) -> List[ToolOutput]:
+    """
+    Execute all tool calls requested in one step concurrently.
+    """
+    with ThreadPoolExecutor(max_workers=max(len(tool_calls), 1)) as executor:
+        return list(executor.map(execute_tool_call, tool_calls))
+
+
+ACTIVE_RUN_STATUSES = ("queued", "in_progress", "requires_action")
+
+
+def cancel_active_run(thread_id: str, run_id: str = None):
+    """
+    Cancel run_id, or the thread's latest run if it is still active
+    when no run event has arrived yet. Returns the cancelled run's id.
+    """
+    if run_id is None:
+        latest = next(iter(agents_client.runs.list(
+            thread_id=thread_id, limit=1, order="desc"
+        )), None)
+        if latest is None or latest.status not in ACTIVE_RUN_STATUSES:
+            return None
+        run_id = latest.id
+
+    agents_client.runs.cancel(thread_id=thread_id, run_id=run_id)
+    return run_id
+
+
+def stream_run(thread_id: str, agent_id: str):
+    """
+    Stream a run, writing text deltas to stdout as they arrive and
+    executing requested tool calls in parallel.
+    The stream is consumed on a worker thread; if it has not finished after
+    RUN_TIMEOUT_SECONDS the run is cancelled and the caller returns anyway,
+    since the SDK offers no way to interrupt a blocked stream read.
+    """
+    run = None
+    error = None
+    timed_out = threading.Event()
+
+    def consume():
+        nonlocal run, error
+
+        try:
+            with agents_client.runs.stream(
+                thread_id=thread_id,
+                agent_id=agent_id,
+                max_completion_tokens=MAX_COMPLETION_TOKENS
+            ) as stream:
+                for _, event_data, _ in stream:
+                    if timed_out.is_set():
+                        break
+
+                    if isinstance(event_data, MessageDeltaChunk):
+                        sys.stdout.write(event_data.text)
+                        sys.stdout.flush()
+
+                    elif isinstance(event_data, ThreadRun):
+                        run = event_data
+
+                        if run.status == "requires_action" and isinstance(
+                            run.required_action, SubmitToolOutputsAction
+                        ):
+                            agents_client.runs.submit_tool_outputs_stream(
+                                thread_id=thread_id,
+                                run_id=run.id,
+                                tool_outputs=execute_tool_calls(
+                                    run.required_action.submit_tool_outputs.tool_calls
+                                ),
+                                event_handler=stream
+                            )
+        except Exception as e:
+            error = e
+
+    worker = threading.Thread(target=consume, daemon=True)
+    worker.start()
+    worker.join(RUN_TIMEOUT_SECONDS)
+
+    if worker.is_alive():
+        timed_out.set()
+        print(f"\nRun exceeded {RUN_TIMEOUT_SECONDS}s, cancelling")
+
+        try:
+            run_id = cancel_active_run(thread_id, run.id if run is not None else None)
+            if run_id is not None:
+                run = agents_client.runs.get(thread_id=thread_id, run_id=run_id)
+        except Exception as e:
+            print(f"Failed to cancel run: {e}")
+
+    elif error is not None:
+        raise error
+
+    sys.stdout.write("\n")
+    return run
+
+
 with agents_client:
     commander_agent = agents_client.get_agent(
         agent_id=""
@@ -129,18 +305,15 @@ with agents_client:
     print(f"Message ID: {message.id}")
 
     # ✅ Attach tools here
-    run = agents_client.runs.create_and_process(
+    run = stream_run(
         thread_id=thread.id,
         agent_id=commander_agent.id
-        
     )
 
-    print(f"Run finished with status: {run.status}")
-
-    if run.status == "failed":
-        print(f"Run failed: {run.last_error}")
+    if run is None:
+        print("Run stream ended without a run status")
+    else:
+        print(f"Run finished with status: {run.status}")
 
-    messages = agents_client.messages.list(thread_id=thread.id)
-    for msg in messages:
-        if msg.text_messages:
-            print(f"{msg.role}: {msg.text_messages[-1].text.value}")
+        if run.status == "failed":
+            print(f"Run failed: {run.last_error}")
@@ -1,7 +1,8 @@
 
 
-import json
-from typing import Dict, Any, List
+from concurrent.futures import ThreadPoolExecutor
+from functools import cache, lru_cache
+from typing import Dict, Any, Mapping, Set
 
 from azure.ai.agents import AgentsClient
 from azure.ai.agents.models import (
@@ -11,6 +12,51 @@ from azure.ai.agents.models import (
 )
 from azure.identity import DefaultAzureCredential
 
+from json_utils import dumps, freeze, load_json
+from keyword_matcher import KeywordMatcher
+
+
+# ===================================================
+# Metric Keyword Rules (built once at import)
+# ===================================================
+
+_METRIC_MATCHER = KeywordMatcher({
+    "connection": ["connection"],
+    "at_limit": ["1.0", "100"],
+    "scaling": ["replica", "autoscale"],
+    "latency": ["latency", "p99", "p95"],
+    "cpu": ["cpu"],
+    "low": ["low"]
+})
+
+# (required tags, evidence key, finding)
+_METRIC_RULES = [
+    # --- Capacity / saturation signals ---
+    (
+        {"connection", "at_limit"},
+        "db_connection_saturation",
+        "Database active connections reached maximum capacity"
+    ),
+    # --- Scaling behavior ---
+    (
+        {"scaling"},
+        "autoscaling_event",
+        "Application autoscaled rapidly under traffic spike"
+    ),
+    # --- Latency correlation ---
+    (
+        {"latency"},
+        "latency_spike",
+        "Latency increased in correlation with load and saturation"
+    ),
+    # --- Resource utilization sanity check ---
+    (
+        {"cpu", "low"},
+        "cpu_not_bottleneck",
+        "Database CPU remained underutilized during incident"
+    )
+]
+
 
 # ===================================================
 # Metric Agent Analysis Function
@@ -28,30 +74,21 @@ def analyze_metrics(input_payload: Dict[str, Any]) -> Dict[str, Any]:
     incident_id = incident["incident_id"]
     metrics = context.get("metrics", {})
 
-    findings: List[str] = []
+    findings: Set[str] = set()
     evidence: Dict[str, Any] = {}
 
-    metrics_text = json.dumps(metrics).lower()
+    # Scan the serialized parsed metrics rather than raw file bytes: the
+    # "1.0"/"100" rule would otherwise match file formatting like 0.100.
+    # Nothing to scan when no metrics were provided
+    if metrics:
+        hits = _METRIC_MATCHER.scan(dumps(metrics).lower())
+    else:
+        hits = set()
 
-    # --- Capacity / saturation signals ---
-    if "connection" in metrics_text and ("1.0" in metrics_text or "100" in metrics_text):
-        findings.append("Database active connections reached maximum capacity")
-        evidence["db_connection_saturation"] = True
-
-    # --- Scaling behavior ---
-    if "replica" in metrics_text or "autoscale" in metrics_text:
-        findings.append("Application autoscaled rapidly under traffic spike")
-        evidence["autoscaling_event"] = True
-
-    # --- Latency correlation ---
-    if "latency" in metrics_text or "p99" in metrics_text or "p95" in metrics_text:
-        findings.append("Latency increased in correlation with load and saturation")
-        evidence["latency_spike"] = True
-
-    # --- Resource utilization sanity check ---
-    if "cpu" in metrics_text and "low" in metrics_text:
-        findings.append("Database CPU remained underutilized during incident")
-        evidence["cpu_not_bottleneck"] = True
+    for required, key, finding in _METRIC_RULES:
+        if required <= hits:
+            findings.add(finding)
+            evidence[key] = True
 
     hypothesis = (
         "Metrics indicate database capacity constrained by connection limits "
@@ -61,7 +98,7 @@ def analyze_metrics(input_payload: Dict[str, Any]) -> Dict[str, Any]:
     return {
         "agent": "metric_agent",
         "incident_id": incident_id,
-        "findings": list(set(findings)),
+        "findings": sorted(findings),
         "evidence": evidence,
         "hypothesis": hypothesis,
         "confidence": 0.91
@@ -72,29 +109,71 @@ def analyze_metrics(input_payload: Dict[str, Any]) -> Dict[str, Any]:
 # Context Loader (METRICS ONLY)
 # ===================================================
 
-def load_metric_context(incident_id: str) -> Dict[str, Any]:
+@lru_cache(maxsize=32)
+def load_metric_context(incident_id: str) -> Mapping[str, Any]:
     """
     Load metrics for an incident to simulate upstream orchestration.
+    Cached per incident; the result is read-only.
     """
     from pathlib import Path
 
     base = Path("mock-data") / "metrics" / incident_id
 
-    return {
-        "application": json.load(open(base / "application_metrics.json")),
-        "database": json.load(open(base / "database_metrics.json")),
-        "infrastructure": json.load(open(base / "infrastructure_metrics.json")),
+    paths = {
+        "application": base / "application_metrics.json",
+        "database": base / "database_metrics.json",
+        "infrastructure": base / "infrastructure_metrics.json",
     }
 
+    # Files are independent; load them concurrently
+    with ThreadPoolExecutor(max_workers=len(paths)) as executor:
+        loaded = dict(zip(paths, executor.map(load_json, paths.values())))
+
+    return freeze(loaded)
+
+
+@lru_cache(maxsize=32)
+def _metric_context_json(incident_id: str) -> bytes:
+    return dumps(load_metric_context(incident_id))
+
+
+def build_metric_agent_message(
+    incident: Dict[str, Any],
+    instructions: str
+) -> str:
+    """
+    Assemble the Metric Agent input JSON around the cached, pre-serialized
+    metric context so only the incident-specific parts are serialized per call.
+    """
+    return (
+        b'{"incident":' + dumps(incident)
+        + b',"context":{"metrics":' + _metric_context_json(incident["incident_id"])
+        + b'},"instructions":' + dumps(instructions)
+        + b"}"
+    ).decode()
+
+
+def invalidate_metric_cache() -> None:
+    """
+    Drop cached metric context so the next load re-reads files from disk.
+    """
+    load_metric_context.cache_clear()
+    _metric_context_json.cache_clear()
+
 
 # ===================================================
 # Create Agents Client
 # ===================================================
 
-agents_client = AgentsClient(
-    endpoint="",
-    credential=DefaultAzureCredential()
-)
+@cache
+def _client() -> AgentsClient:
+    """
+    Lazily construct the shared Azure Agents client on first use.
+    """
+    return AgentsClient(
+        endpoint="",
+        credential=DefaultAzureCredential()
+    )
 
 
 # ===================================================
@@ -116,11 +195,16 @@ metric_agent_tools = ToolSet(
 # Create Metric Agent
 # ===================================================
 
-metric_agent = agents_client.agents.create(
-    name="metric_agent",
-    description="Analyzes metrics to detect capacity, saturation, and scaling issues",
-    tools=metric_agent_tools,
-    instructions="""
+@cache
+def get_metric_agent():
+    """
+    Create the Metric agent on first use and reuse it afterwards.
+    """
+    return _client().agents.create(
+        name="metric_agent",
+        description="Analyzes metrics to detect capacity, saturation, and scaling issues",
+        tools=metric_agent_tools,
+        instructions="""
 You are a Metric Analysis Agent.
 
 Rules:
@@ -131,7 +215,7 @@ Rules:
 - You return findings, evidence, hypothesis, and confidence.
 - Output structured JSON only.
 """
-)
+    )
 
 
 # ===================================================
@@ -147,33 +231,25 @@ if __name__ == "__main__":
         "severity": "SEV-1"
     }
 
-    metric_context = load_metric_context(INCIDENT_ID)
-
-    metric_agent_input = {
-        "incident": incident_payload,
-        "context": {
-            "metrics": metric_context
-        },
-        "instructions": (
-            "Analyze only the provided metrics and return findings. "
-            "Do not infer root cause beyond metric evidence."
-        )
-    }
+    instructions = (
+        "Analyze only the provided metrics and return findings. "
+        "Do not infer root cause beyond metric evidence."
+    )
 
     # Create a thread
-    thread = agents_client.threads.create()
+    thread = _client().threads.create()
 
     # Send context-enriched payload to Metric Agent
-    agents_client.messages.create(
+    _client().messages.create(
         thread_id=thread.id,
         role=MessageRole.USER,
-        content=json.dumps(metric_agent_input, indent=2)
+        content=build_metric_agent_message(incident_payload, instructions)
     )
 
     # Run Metric Agent
-    run = agents_client.runs.create(
+    run = _client().runs.create(
         thread_id=thread.id,
-        agent_id=metric_agent.id
+        agent_id=get_metric_agent().id
     )
 
     print(f"Metric agent run started: {run.id}")
@@ -1,35 +1,49 @@
-import json
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
 from pathlib import Path
 
-BASE_PATH = Path("mock-data")
+from json_utils import freeze, load_json
 
-def load_json(path: Path):
-    with open(path, "r") as f:
-        return json.load(f)
+BASE_PATH = Path("mock-data")
 
+@lru_cache(maxsize=32)
 def load_all_mock_data(incident_id: str):
-    return {
-        "topology": load_json(BASE_PATH / "topology/production.json"),
-        "scenario": load_json(
-            BASE_PATH / f"scenarios/{incident_id}-database-failure.json"
-        ),
-        "logs": {
-            "high_level": load_json(BASE_PATH / f"logs/{incident_id}/high_level.json"),
-            "application": load_json(BASE_PATH / f"logs/{incident_id}/application_logs.json"),
-            "database": load_json(BASE_PATH / f"logs/{incident_id}/database_logs.json"),
-            "infrastructure": load_json(
-                BASE_PATH / f"logs/{incident_id}/infrastructure_logs.json"
+    logs_base = BASE_PATH / "logs" / incident_id
+    metrics_base = BASE_PATH / "metrics" / incident_id
+
+    # Files are independent; load them concurrently
+    with ThreadPoolExecutor(max_workers=4) as executor:
+        topology = executor.submit(load_json, BASE_PATH / "topology/production.json")
+        scenario = executor.submit(
+            load_json, BASE_PATH / f"scenarios/{incident_id}-database-failure.json"
+        )
+        logs = {
+            "high_level": executor.submit(load_json, logs_base / "high_level.json"),
+            "application": executor.submit(load_json, logs_base / "application_logs.json"),
+            "database": executor.submit(load_json, logs_base / "database_logs.json"),
+            "infrastructure": executor.submit(
+                load_json, logs_base / "infrastructure_logs.json"
             ),
-        },
-        "metrics": {
-            "application": load_json(
-                BASE_PATH / f"metrics/{incident_id}/application_metrics.json"
+        }
+        metrics = {
+            "application": executor.submit(
+                load_json, metrics_base / "application_metrics.json"
             ),
-            "database": load_json(
-                BASE_PATH / f"metrics/{incident_id}/database_metrics.json"
+            "database": executor.submit(
+                load_json, metrics_base / "database_metrics.json"
             ),
-            "infrastructure": load_json(
-                BASE_PATH / f"metrics/{incident_id}/infrastructure_metrics.json"
+            "infrastructure": executor.submit(
+                load_json, metrics_base / "infrastructure_metrics.json"
             ),
         }
-    }
+
+    return freeze({
+        "topology": topology.result(),
+        "scenario": scenario.result(),
+        "logs": {key: future.result() for key, future in logs.items()},
+        "metrics": {key: future.result() for key, future in metrics.items()}
+    })
+
+
+def invalidate_mock_data_cache():
+    load_all_mock_data.cache_clear()
@@ -0,0 +1,203 @@
+import importlib
+import json
+import os
+import sys
+import tempfile
+import unittest
+from pathlib import Path
+from unittest import mock
+
+import json_utils  # noqa: F401  (shared with the agent modules imported below)
+import keyword_matcher  # noqa: F401
+
+AZURE_MODULES = [
+    "azure",
+    "azure.ai",
+    "azure.ai.agents",
+    "azure.ai.agents.models",
+    "azure.identity",
+]
+
+
+def import_agent_module(name: str):
+    """
+    Import an agent module with the Azure SDK mocked out. The SDK is only
+    used for client and tool definitions, which these tests never touch.
+    """
+    with mock.patch.dict(sys.modules, {m: mock.MagicMock() for m in AZURE_MODULES}):
+        sys.modules.pop(name, None)
+        return importlib.import_module(name)
+
+
+commander_agent = import_agent_module("commander_agent")
+log_agent = import_agent_module("log_agent")
+metrics_agent = import_agent_module("metrics_agent")
+mock_data_loader = importlib.import_module("mock_data_loader")
+
+INCIDENT_ID = "inc-db-5001"
+
+FILES = {
+    "topology/production.json": {"services": ["payment-api"]},
+    f"scenarios/{INCIDENT_ID}-database-failure.json": {"incident_id": INCIDENT_ID},
+    f"logs/{INCIDENT_ID}/high_level.json": {"summary": "timeout"},
+    f"logs/{INCIDENT_ID}/application_logs.json": ["retry"],
+    f"logs/{INCIDENT_ID}/database_logs.json": ["too many connections"],
+    f"logs/{INCIDENT_ID}/infrastructure_logs.json": [],
+    f"metrics/{INCIDENT_ID}/application_metrics.json": {"p99": 1200},
+    f"metrics/{INCIDENT_ID}/database_metrics.json": {"connection_util": 1.0},
+    f"metrics/{INCIDENT_ID}/infrastructure_metrics.json": {"replicas": 12},
+}
+
+
+class MockDataTestCase(unittest.TestCase):
+    """
+    Runs each test from a temporary directory holding a mock-data tree.
+    """
+
+    def setUp(self):
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+
+        self.base = Path(tmp.name) / "mock-data"
+        for relative, content in FILES.items():
+            self.write(relative, content)
+
+        cwd = os.getcwd()
+        os.chdir(tmp.name)
+        self.addCleanup(os.chdir, cwd)
+
+        self.invalidate_all()
+        self.addCleanup(self.invalidate_all)
+
+    def write(self, relative: str, content) -> None:
+        path = self.base / relative
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text(json.dumps(content))
+
+    @staticmethod
+    def invalidate_all() -> None:
+        commander_agent.invalidate_context_cache()
+        log_agent.invalidate_log_cache()
+        metrics_agent.invalidate_metric_cache()
+        mock_data_loader.invalidate_mock_data_cache()
+
+
+class LoaderCacheTest(MockDataTestCase):
+
+    def test_log_context_is_cached_until_invalidated(self):
+        first = log_agent.load_log_context(INCIDENT_ID)
+        self.write(f"logs/{INCIDENT_ID}/high_level.json", {"summary": "changed"})
+
+        self.assertIs(log_agent.load_log_context(INCIDENT_ID), first)
+        self.assertEqual(first["high_level"]["summary"], "timeout")
+
+        log_agent.invalidate_log_cache()
+
+        reloaded = log_agent.load_log_context(INCIDENT_ID)
+        self.assertEqual(reloaded["high_level"]["summary"], "changed")
+        message = json.loads(log_agent.build_log_agent_message(
+            {"incident_id": INCIDENT_ID}, "analyze"
+        ))
+        self.assertEqual(message["context"]["logs"]["high_level"]["summary"], "changed")
+
+    def test_metric_context_is_cached_until_invalidated(self):
+        first = metrics_agent.load_metric_context(INCIDENT_ID)
+        self.write(f"metrics/{INCIDENT_ID}/infrastructure_metrics.json", {"replicas": 3})
+
+        self.assertIs(metrics_agent.load_metric_context(INCIDENT_ID), first)
+
+        metrics_agent.invalidate_metric_cache()
+
+        reloaded = metrics_agent.load_metric_context(INCIDENT_ID)
+        self.assertEqual(reloaded["infrastructure"]["replicas"], 3)
+        message = json.loads(metrics_agent.build_metric_agent_message(
+            {"incident_id": INCIDENT_ID}, "analyze"
+        ))
+        self.assertEqual(message["context"]["metrics"]["infrastructure"]["replicas"], 3)
+
+    def test_commander_context_is_cached_until_invalidated(self):
+        first = commander_agent.load_context_data()
+        commander_agent.build_commander_message({"incident_id": INCIDENT_ID}, "plan")
+        self.write("topology/production.json", {"services": ["orders-db"]})
+
+        self.assertIs(commander_agent.load_context_data(), first)
+
+        commander_agent.invalidate_context_cache()
+
+        self.assertEqual(
+            commander_agent.load_context_data()["topology"]["services"], ("orders-db",)
+        )
+        message = json.loads(commander_agent.build_commander_message(
+            {"incident_id": INCIDENT_ID}, "plan"
+        ))
+        self.assertEqual(message["context"]["topology"]["services"], ["orders-db"])
+
+    def test_mock_data_is_cached_until_invalidated(self):
+        first = mock_data_loader.load_all_mock_data(INCIDENT_ID)
+        self.write(f"logs/{INCIDENT_ID}/infrastructure_logs.json", ["node drained"])
+
+        self.assertIs(mock_data_loader.load_all_mock_data(INCIDENT_ID), first)
+
+        mock_data_loader.invalidate_mock_data_cache()
+
+        reloaded = mock_data_loader.load_all_mock_data(INCIDENT_ID)
+        self.assertEqual(reloaded["logs"]["infrastructure"], ("node drained",))
+
+    def test_cached_context_is_read_only(self):
+        logs = log_agent.load_log_context(INCIDENT_ID)
+
+        with self.assertRaises(TypeError):
+            logs["high_level"] = {}
+        with self.assertRaises(AttributeError):
+            logs["application"].append("mutated")
+
+
+class DecideAgentsTest(unittest.TestCase):
+
+    def decide(self, expected_symptoms):
+        return commander_agent.decide_agents({
+            "incident_id": INCIDENT_ID,
+            "expected_symptoms": expected_symptoms
+        })["agents_to_call"]
+
+    def test_dict_of_lists(self):
+        self.assertEqual(
+            self.decide({
+                "application": ["Increased latency", "retry storms"],
+                "database": ["connection pool exhaustion"],
+                "infrastructure": ["config release"]
+            }),
+            ["deploy_intelligence_agent", "logs_agent", "metrics_agent"]
+        )
+
+    def test_list(self):
+        self.assertEqual(self.decide(["timeout"]), ["logs_agent"])
+
+    def test_bare_string(self):
+        self.assertEqual(self.decide("Saturation"), ["metrics_agent"])
+
+    def test_nested_values(self):
+        self.assertEqual(
+            self.decide({"a": [{"x": "timeout"}, ["capacity", 3, None]]}),
+            ["logs_agent", "metrics_agent"]
+        )
+
+    def test_nested_mappings_do_not_leak_repr(self):
+        with mock.patch.object(
+            commander_agent._AGENT_MATCHER, "scan", return_value=set()
+        ) as scan:
+            self.decide({"a": [{"x": "Timeout"}, 3]})
+
+        scan.assert_called_once_with("timeout 3")
+
+    def test_empty_symptoms_return_no_agents(self):
+        for empty in (None, {}, [], ""):
+            self.assertEqual(self.decide(empty), [])
+        self.assertEqual(
+            commander_agent.decide_agents({"incident_id": INCIDENT_ID}),
+            {"incident_id": INCIDENT_ID, "agents_to_call": []}
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,162 @@
+import json
+import os
+import tempfile
+import unittest
+from pathlib import Path
+from unittest import mock
+
+import json_utils
+from json_utils import MMAP_THRESHOLD, dumps, freeze, load_json, loads, read_file
+
+
+class DumpsTest(unittest.TestCase):
+
+    def test_round_trips_plain_json(self):
+        payload = {"a": [1, 2.5, "x", None, True], "b": {"c": "d"}}
+
+        self.assertEqual(loads(dumps(payload)), payload)
+        self.assertEqual(loads(dumps(payload, indent=True)), payload)
+
+    def test_integers_beyond_64_bits_fall_back_to_stdlib(self):
+        payload = {"n": 2 ** 70}
+
+        self.assertEqual(dumps(payload), json.dumps(payload).encode("utf-8"))
+
+    def test_unserializable_values_still_raise(self):
+        with self.assertRaises(TypeError):
+            dumps({"x": object()})
+
+    def test_stdlib_fallback_without_orjson(self):
+        payload = {"a": [1, "x"]}
+
+        with mock.patch.object(json_utils, "orjson", None):
+            self.assertEqual(dumps(payload), json.dumps(payload).encode("utf-8"))
+            self.assertEqual(loads(b'{"a": [1, "x"]}'), payload)
+
+
+class FreezeTest(unittest.TestCase):
+
+    PAYLOAD = {"a": [1, {"b": [2, 3]}], "c": {"d": "e"}, "f": None}
+
+    def test_frozen_values_serialize_like_the_original(self):
+        self.assertEqual(dumps(freeze(self.PAYLOAD)), dumps(self.PAYLOAD))
+        self.assertEqual(
+            dumps(freeze(self.PAYLOAD), indent=True),
+            dumps(self.PAYLOAD, indent=True)
+        )
+
+    def test_frozen_values_serialize_like_the_original_without_orjson(self):
+        with mock.patch.object(json_utils, "orjson", None):
+            self.assertEqual(dumps(freeze(self.PAYLOAD)), dumps(self.PAYLOAD))
+
+    def test_frozen_values_are_read_only(self):
+        frozen = freeze(self.PAYLOAD)
+
+        with self.assertRaises(TypeError):
+            frozen["c"] = {}
+        with self.assertRaises(TypeError):
+            frozen["a"][1]["b"] += (4,)
+        self.assertIsInstance(frozen["a"], tuple)
+
+
+class FileTestCase(unittest.TestCase):
+
+    def setUp(self):
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        self.dir = Path(tmp.name)
+
+        self.small = self.write("small.json", {"logs": ["timeout"] * 10})
+        self.large = self.write(
+            "large.json", {"logs": [{"message": "x" * 100, "n": i} for i in range(1000)]}
+        )
+        self.empty = self.dir / "empty.json"
+        self.empty.write_bytes(b"")
+
+        self.assertLess(self.small.stat().st_size, MMAP_THRESHOLD)
+        self.assertGreater(self.large.stat().st_size, MMAP_THRESHOLD)
+
+    def write(self, name: str, content) -> Path:
+        path = self.dir / name
+        path.write_text(json.dumps(content))
+        return path
+
+
+class ReadFileTest(FileTestCase):
+
+    def test_reads_whole_files(self):
+        for path in (self.small, self.large, self.empty):
+            self.assertEqual(read_file(path), path.read_bytes())
+
+    def test_loops_over_short_reads(self):
+        real_read = os.read
+
+        def short_read(fd, size):
+            return real_read(fd, min(size, 4096))
+
+        with mock.patch.object(json_utils.os, "read", side_effect=short_read) as read:
+            self.assertEqual(read_file(self.large), self.large.read_bytes())
+
+        self.assertGreater(read.call_count, 1)
+
+    def test_opens_read_only_with_platform_flags(self):
+        real_open = os.open
+
+        with mock.patch.object(json_utils.os, "open", side_effect=real_open) as open_:
+            read_file(self.small)
+
+        flags = open_.call_args.args[1]
+        self.assertEqual(flags & json_utils._OPEN_FLAGS, json_utils._OPEN_FLAGS)
+        self.assertEqual(
+            json_utils._OPEN_FLAGS & getattr(os, "O_BINARY", 0), getattr(os, "O_BINARY", 0)
+        )
+
+    @unittest.skipUnless(json_utils._O_NOATIME, "O_NOATIME not available")
+    def test_retries_without_noatime_on_permission_error(self):
+        real_open = os.open
+
+        def open_(path, flags):
+            if flags & json_utils._O_NOATIME:
+                raise PermissionError("not the file owner")
+            return real_open(path, flags)
+
+        with mock.patch.object(json_utils.os, "open", side_effect=open_) as opened:
+            self.assertEqual(read_file(self.small), self.small.read_bytes())
+
+        self.assertEqual(opened.call_count, 2)
+        self.assertEqual(opened.call_args.args[1], json_utils._OPEN_FLAGS)
+
+
+class LoadJsonTest(FileTestCase):
+
+    def test_small_files_are_read_directly(self):
+        with mock.patch.object(json_utils, "_load_mmap") as load_mmap:
+            self.assertEqual(load_json(self.small), json.loads(self.small.read_text()))
+
+        load_mmap.assert_not_called()
+
+    @unittest.skipIf(json_utils.orjson is None, "mmap path requires orjson")
+    def test_large_files_are_memory_mapped(self):
+        with mock.patch.object(
+            json_utils, "_load_mmap", wraps=json_utils._load_mmap
+        ) as load_mmap:
+            self.assertEqual(load_json(self.large), json.loads(self.large.read_text()))
+
+        load_mmap.assert_called_once()
+
+    @unittest.skipIf(json_utils.orjson is None, "mmap path requires orjson")
+    def test_both_load_paths_agree(self):
+        for path in (self.small, self.large):
+            self.assertEqual(json_utils._load_mmap(path), loads(read_file(path)))
+
+    def test_large_files_without_orjson(self):
+        with mock.patch.object(json_utils, "orjson", None):
+            self.assertEqual(load_json(self.large), json.loads(self.large.read_text()))
+
+    def test_empty_file_is_invalid_json(self):
+        with self.assertRaises(ValueError):
+            load_json(self.empty)
+
+
+if __name__ == "__main__":
+    unittest.main()
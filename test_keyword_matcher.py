@@ -0,0 +1,67 @@
+import random
+import unittest
+from unittest import mock
+
+import keyword_matcher
+from keyword_matcher import KeywordMatcher
+
+
+# Overlapping keywords across tags: shared prefixes ("connection" /
+# "connections"), keywords nested inside others ("low" / "slow"), and
+# matches that overlap at different offsets ("on" / "nn").
+GROUPS = {
+    "db": ["connection", "dbtimeout"],
+    "pool": ["connections", "too many connections"],
+    "short": ["on", "nn"],
+    "limit": ["1.0", "100"],
+    "cpu": ["low", "slow"],
+}
+
+ALPHABET = "connectiosmay 1.0lwdbtimeu"
+
+
+def expected_tags(text: str) -> set:
+    return {
+        tag for tag, keywords in GROUPS.items()
+        if any(keyword in text for keyword in keywords)
+    }
+
+
+def sample_texts(count: int = 2000):
+    rng = random.Random(0)
+    keywords = [keyword for group in GROUPS.values() for keyword in group]
+
+    yield ""
+    yield from keywords
+    for _ in range(count):
+        text = "".join(rng.choice(ALPHABET) for _ in range(rng.randint(0, 40)))
+        if rng.random() < 0.3:
+            text += rng.choice(keywords)
+        yield text
+
+
+class KeywordMatcherTest(unittest.TestCase):
+
+    def assert_matches_substring_checks(self, matcher: KeywordMatcher):
+        for text in sample_texts():
+            expected = expected_tags(text)
+            self.assertEqual(matcher.scan(text), expected, text)
+            self.assertEqual(matcher.scan(text.encode("utf-8")), expected, text)
+
+    def test_regex_fallback_matches_substring_checks(self):
+        with mock.patch.object(keyword_matcher, "ahocorasick", None):
+            matcher = KeywordMatcher(GROUPS)
+
+        self.assertIsNone(matcher._automaton)
+        self.assert_matches_substring_checks(matcher)
+
+    @unittest.skipIf(keyword_matcher.ahocorasick is None, "pyahocorasick not installed")
+    def test_automaton_matches_substring_checks(self):
+        matcher = KeywordMatcher(GROUPS)
+
+        self.assertIsNotNone(matcher._automaton)
+        self.assert_matches_substring_checks(matcher)
+
+
+if __name__ == "__main__":
+    unittest.main()